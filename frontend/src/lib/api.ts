@@ -166,7 +166,9 @@ export async function fetchProps(token: string, sport: string): Promise<PropsGam
     const data = await res.json().catch(() => ({})) as { error?: string };
     throw new Error(data.error ?? 'Failed to fetch props');
   }
-  return res.json() as Promise<PropsGame[]>;
+  // The worker sends the shared stat map once; fan it back out by reference
+  const data = await res.json() as { games: GameOdds[]; playerStats?: Record<string, StatContext> };
+  return data.games.map(g => ({ ...g, playerStats: data.playerStats }));
 }
 
 export async function fetchOdds(token: string, sport: string): Promise<GameOdds[]> {
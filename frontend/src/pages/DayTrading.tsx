@@ -26,7 +26,10 @@ function calcResults(s: CalcState) {
   return { riskPerShare, maxLoss, shares, posVal, reward, rrRatio };
 }
 
-function fmt$(n: number) { return `$${n.toLocaleString('en-US', { minimumFractionDigits: 2, maximumFractionDigits: 2 })}`; }
+// Shared formatter — toLocaleString builds a fresh Intl.NumberFormat per call
+const USD_FMT = new Intl.NumberFormat('en-US', { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+
+function fmt$(n: number) { return `$${USD_FMT.format(n)}`; }
 
 // ─── Main component ───────────────────────────────────────────────────────────
 
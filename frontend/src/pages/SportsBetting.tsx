@@ -1,6 +1,6 @@
 import { useState, useEffect, useMemo } from 'react';
 import { Activity, RefreshCw, DollarSign, TrendingUp, Ban, AlertCircle, Star, Trophy, CheckCircle, XCircle, Clock, Users } from 'lucide-react';
-import { fetchOdds, fetchScores, fetchProps, GameOdds, GameScore, PropsGame, StatContext } from '../lib/api';
+import { fetchOdds, fetchScores, fetchProps, GameOdds, GameScore, OddsOutcome, PropsGame, StatContext } from '../lib/api';
 import { useAuth } from '../hooks/useAuth';
 
 // ─── Types ───────────────────────────────────────────────────────────────────
@@ -84,22 +84,23 @@ const MIN_CONFIDENCE_PROP = 22;
 function imp(odds: number) {
   return odds > 0 ? 100 / (odds + 100) : Math.abs(odds) / (Math.abs(odds) + 100);
 }
-function noVig(a: number, b: number): [number, number] {
-  const ia = imp(a), ib = imp(b), t = ia + ib;
-  return [ia / t, ib / t];
-}
 function fmtOdds(n: number)   { return n > 0 ? `+${n}` : `${n}`; }
 function fmtSpread(n: number) { return n >= 0 ? `+${n}` : `${n}`; }
 function pct(n: number)       { return `${(n * 100).toFixed(1)}%`; }
 
+// toLocale* builds a fresh Intl formatter per call; fmtTime runs for every
+// card on every render, so share two hoisted instances instead
+const DAY_FMT  = new Intl.DateTimeFormat('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
+const TIME_FMT = new Intl.DateTimeFormat('en-US', { hour: 'numeric', minute: '2-digit' });
+
 function fmtTime(iso: string) {
   const d = new Date(iso);
   const today = new Date(), tomorrow = new Date();
   tomorrow.setDate(tomorrow.getDate() + 1);
   const day = d.toDateString() === today.toDateString() ? 'Today'
     : d.toDateString() === tomorrow.toDateString() ? 'Tomorrow'
-    : d.toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
-  return `${day} · ${d.toLocaleTimeString('en-US', { hour: 'numeric', minute: '2-digit' })}`;
+    : DAY_FMT.format(d);
+  return `${day} · ${TIME_FMT.format(d)}`;
 }
 
 function stdDev(vals: number[]): number {
@@ -133,33 +134,59 @@ function statBoost(statCtx: StatContext, propLine: number, isOver: boolean): num
 
 // ─── Processing ──────────────────────────────────────────────────────────────
 
-function consensusPoint(g: GameOdds, marketKey: string, sideName: string): number | null {
-  const points: number[] = [];
+type MarketBooks = Array<{ book: string; outcomes: OddsOutcome[] }>;
+
+// One pass over a game's bookmakers grouped by market key, so consensusPoint
+// and gatherLines don't each re-scan every bookmaker's market list
+function indexMarkets(g: GameOdds): Map<string, MarketBooks> {
+  const idx = new Map<string, MarketBooks>();
   for (const bm of g.bookmakers) {
-    const mkt = bm.markets.find(m => m.key === marketKey);
-    if (!mkt) continue;
-    const out = mkt.outcomes.find(o => o.name === sideName);
+    for (const mkt of bm.markets) {
+      let books = idx.get(mkt.key);
+      if (!books) { books = []; idx.set(mkt.key, books); }
+      books.push({ book: bm.title, outcomes: mkt.outcomes });
+    }
+  }
+  return idx;
+}
+
+function consensusPoint(books: MarketBooks, sideName: string): number | null {
+  const points: number[] = [];
+  for (const { outcomes } of books) {
+    const out = outcomes.find(o => o.name === sideName);
     if (out?.point != null) points.push(out.point);
   }
   if (points.length === 0) return null;
-  const freq: Record<string, number> = {};
-  for (const p of points) freq[String(p)] = (freq[String(p)] ?? 0) + 1;
-  return parseFloat(Object.entries(freq).sort((a, b) => b[1] - a[1])[0][0]);
+  // Only the modal point matters — track the running max instead of building
+  // a stringified frequency table and sorting it
+  const freq = new Map<number, number>();
+  let best = points[0], bestCount = 0;
+  for (const p of points) {
+    const c = (freq.get(p) ?? 0) + 1;
+    freq.set(p, c);
+    if (c > bestCount) { best = p; bestCount = c; }
+  }
+  return best;
 }
 
-function pairLines(
-  g: GameOdds, marketKey: string, nameA: string, nameB: string,
+// Gather both sides' lines and the paired books in one scan per market —
+// the same accumulate-everything-together shape processProps already uses
+function gatherLines(
+  books: MarketBooks, nameA: string, nameB: string,
   ptA?: number | null, ptB?: number | null,
-): Array<{ a: BookLine; b: BookLine }> {
+): { pairs: Array<{ a: BookLine; b: BookLine }>; linesA: BookLine[]; linesB: BookLine[] } {
   const pairs: Array<{ a: BookLine; b: BookLine }> = [];
-  for (const bm of g.bookmakers) {
-    const mkt = bm.markets.find(m => m.key === marketKey);
-    if (!mkt) continue;
-    const outA = mkt.outcomes.find(o => o.name === nameA && (ptA == null || Math.abs((o.point ?? 0) - ptA) < 0.01));
-    const outB = mkt.outcomes.find(o => o.name === nameB && (ptB == null || Math.abs((o.point ?? 0) - ptB) < 0.01));
-    if (outA && outB) pairs.push({ a: { book: bm.title, odds: outA.price }, b: { book: bm.title, odds: outB.price } });
+  const linesA: BookLine[] = [], linesB: BookLine[] = [];
+  for (const { book, outcomes } of books) {
+    const outA = outcomes.find(o => o.name === nameA && (ptA == null || Math.abs((o.point ?? 0) - ptA) < 0.01));
+    const outB = outcomes.find(o => o.name === nameB && (ptB == null || Math.abs((o.point ?? 0) - ptB) < 0.01));
+    const a = outA ? { book, odds: outA.price } : null;
+    const b = outB ? { book, odds: outB.price } : null;
+    if (a) linesA.push(a);
+    if (b) linesB.push(b);
+    if (a && b) pairs.push({ a, b });
   }
-  return pairs;
+  return { pairs, linesA, linesB };
 }
 
 function fairProbsAnalysis(pairs: Array<{ a: BookLine; b: BookLine }>): {
@@ -168,10 +195,11 @@ function fairProbsAnalysis(pairs: Array<{ a: BookLine; b: BookLine }>): {
   const samplesA: number[] = [], samplesB: number[] = [];
   let vigSum = 0;
   for (const { a, b } of pairs) {
-    const [fa, fb] = noVig(a.odds, b.odds);
-    samplesA.push(fa);
-    samplesB.push(fb);
-    vigSum += imp(a.odds) + imp(b.odds) - 1;
+    // Fair probs and vig share the same implied probs — compute them once
+    const ia = imp(a.odds), ib = imp(b.odds), t = ia + ib;
+    samplesA.push(ia / t);
+    samplesB.push(ib / t);
+    vigSum += t - 1;
   }
   const n = pairs.length;
   return {
@@ -182,17 +210,6 @@ function fairProbsAnalysis(pairs: Array<{ a: BookLine; b: BookLine }>): {
   };
 }
 
-function collectLines(g: GameOdds, marketKey: string, sideName: string, matchPt?: number | null): BookLine[] {
-  const lines: BookLine[] = [];
-  for (const bm of g.bookmakers) {
-    const mkt = bm.markets.find(m => m.key === marketKey);
-    if (!mkt) continue;
-    const out = mkt.outcomes.find(o => o.name === sideName && (matchPt == null || Math.abs((o.point ?? 0) - matchPt) < 0.01));
-    if (out) lines.push({ book: bm.title, odds: out.price });
-  }
-  return lines;
-}
-
 function buildStrictPlay(
   g: GameOdds,
   market: 'h2h' | 'spreads' | 'totals',
@@ -205,7 +222,8 @@ function buildStrictPlay(
 ): Play | null {
   if (allLines.length === 0) return null;
   const best = allLines.reduce((b, x) => x.odds > b.odds ? x : b);
-  const edge = fairProb - imp(best.odds);
+  const bestImp = imp(best.odds);
+  const edge = fairProb - bestImp;
   if (edge < MIN_EDGE) return null;
   const std = stdDev(fairProbSamples);
   const conf = calcConfidence(edge, allLines.length, std, avgVig);
@@ -214,8 +232,9 @@ function buildStrictPlay(
     gameId: g.id, sport: g.sport_title, homeTeam: g.home_team, awayTeam: g.away_team,
     commenceTime: g.commence_time, side, market, point,
     bestBook: best.book, bestOdds: best.odds,
-    impliedProb: imp(best.odds), fairProb, edge, confidence: conf,
-    books: [...allLines].sort((a, b) => b.odds - a.odds),
+    impliedProb: bestImp, fairProb, edge, confidence: conf,
+    // allLines is built fresh by gatherLines for this call — sort in place
+    books: allLines.sort((a, b) => b.odds - a.odds),
     units: edge >= 0.05 ? 1 : edge >= 0.035 ? 0.5 : 0.25,
   };
 }
@@ -227,37 +246,43 @@ function processGames(games: GameOdds[]): { plays: Play[]; rejects: Reject[] } {
     const gamePlays: Play[] = [];
     let rejectReason = '';
 
-    const h2hPairs = pairLines(g, 'h2h', g.home_team, g.away_team);
+    const markets = indexMarkets(g);
+    const h2hBooks = markets.get('h2h') ?? [];
+    const spreadBooks = markets.get('spreads') ?? [];
+    const totalBooks = markets.get('totals') ?? [];
+
+    const h2h = gatherLines(h2hBooks, g.home_team, g.away_team);
+    const h2hPairs = h2h.pairs;
     if (h2hPairs.length >= MIN_BOOKS_H2H) {
       const { avgA: fairH, avgB: fairA, samplesA, samplesB, avgVig } = fairProbsAnalysis(h2hPairs);
-      const pH = buildStrictPlay(g, 'h2h', g.home_team, fairH, samplesA, avgVig, collectLines(g, 'h2h', g.home_team));
-      const pA = buildStrictPlay(g, 'h2h', g.away_team, fairA, samplesB, avgVig, collectLines(g, 'h2h', g.away_team));
+      const pH = buildStrictPlay(g, 'h2h', g.home_team, fairH, samplesA, avgVig, h2h.linesA);
+      const pA = buildStrictPlay(g, 'h2h', g.away_team, fairA, samplesB, avgVig, h2h.linesB);
       if (pH) gamePlays.push(pH);
       if (pA) gamePlays.push(pA);
     } else if (h2hPairs.length > 0) {
       rejectReason = `Only ${h2hPairs.length} book${h2hPairs.length > 1 ? 's' : ''} — need ${MIN_BOOKS_H2H}+ for reliable consensus.`;
     }
 
-    const homeSpreadPt = consensusPoint(g, 'spreads', g.home_team);
-    const awaySpreadPt = consensusPoint(g, 'spreads', g.away_team);
+    const homeSpreadPt = consensusPoint(spreadBooks, g.home_team);
+    const awaySpreadPt = consensusPoint(spreadBooks, g.away_team);
     if (homeSpreadPt != null && awaySpreadPt != null) {
-      const spreadPairs = pairLines(g, 'spreads', g.home_team, g.away_team, homeSpreadPt, awaySpreadPt);
-      if (spreadPairs.length >= MIN_BOOKS_MKT) {
-        const { avgA: fairH, avgB: fairA, samplesA, samplesB, avgVig } = fairProbsAnalysis(spreadPairs);
-        const pH = buildStrictPlay(g, 'spreads', `${g.home_team} ${fmtSpread(homeSpreadPt)}`, fairH, samplesA, avgVig, collectLines(g, 'spreads', g.home_team, homeSpreadPt), homeSpreadPt);
-        const pA = buildStrictPlay(g, 'spreads', `${g.away_team} ${fmtSpread(awaySpreadPt)}`, fairA, samplesB, avgVig, collectLines(g, 'spreads', g.away_team, awaySpreadPt), awaySpreadPt);
+      const spreads = gatherLines(spreadBooks, g.home_team, g.away_team, homeSpreadPt, awaySpreadPt);
+      if (spreads.pairs.length >= MIN_BOOKS_MKT) {
+        const { avgA: fairH, avgB: fairA, samplesA, samplesB, avgVig } = fairProbsAnalysis(spreads.pairs);
+        const pH = buildStrictPlay(g, 'spreads', `${g.home_team} ${fmtSpread(homeSpreadPt)}`, fairH, samplesA, avgVig, spreads.linesA, homeSpreadPt);
+        const pA = buildStrictPlay(g, 'spreads', `${g.away_team} ${fmtSpread(awaySpreadPt)}`, fairA, samplesB, avgVig, spreads.linesB, awaySpreadPt);
         if (pH) gamePlays.push(pH);
         if (pA) gamePlays.push(pA);
       }
     }
 
-    const overPt = consensusPoint(g, 'totals', 'Over');
+    const overPt = consensusPoint(totalBooks, 'Over');
     if (overPt != null) {
-      const totalPairs = pairLines(g, 'totals', 'Over', 'Under', overPt, overPt);
-      if (totalPairs.length >= MIN_BOOKS_MKT) {
-        const { avgA: fairO, avgB: fairU, samplesA, samplesB, avgVig } = fairProbsAnalysis(totalPairs);
-        const pO = buildStrictPlay(g, 'totals', `Over ${overPt}`, fairO, samplesA, avgVig, collectLines(g, 'totals', 'Over', overPt), overPt);
-        const pU = buildStrictPlay(g, 'totals', `Under ${overPt}`, fairU, samplesB, avgVig, collectLines(g, 'totals', 'Under', overPt), overPt);
+      const totals = gatherLines(totalBooks, 'Over', 'Under', overPt, overPt);
+      if (totals.pairs.length >= MIN_BOOKS_MKT) {
+        const { avgA: fairO, avgB: fairU, samplesA, samplesB, avgVig } = fairProbsAnalysis(totals.pairs);
+        const pO = buildStrictPlay(g, 'totals', `Over ${overPt}`, fairO, samplesA, avgVig, totals.linesA, overPt);
+        const pU = buildStrictPlay(g, 'totals', `Under ${overPt}`, fairU, samplesB, avgVig, totals.linesB, overPt);
         if (pO) gamePlays.push(pO);
         if (pU) gamePlays.push(pU);
       }
@@ -266,7 +291,7 @@ function processGames(games: GameOdds[]): { plays: Play[]; rejects: Reject[] } {
     if (gamePlays.length > 0) {
       plays.push(...gamePlays);
     } else {
-      const homeH2H = collectLines(g, 'h2h', g.home_team), awayH2H = collectLines(g, 'h2h', g.away_team);
+      const homeH2H = h2h.linesA, awayH2H = h2h.linesB;
       const bestH = homeH2H.length > 0 ? homeH2H.reduce((b, x) => x.odds > b.odds ? x : b) : null;
       const bestA = awayH2H.length > 0 ? awayH2H.reduce((b, x) => x.odds > b.odds ? x : b) : null;
       rejects.push({
@@ -344,7 +369,8 @@ function processProps(propsGames: PropsGame[]): Play[] {
       const statCtxRaw = game.playerStats?.[`${group.playerName}|${group.market}`];
 
       const bestOver = group.overLines.reduce((b, x) => x.odds > b.odds ? x : b);
-      const edgeO = fairO - imp(bestOver.odds);
+      const impO = imp(bestOver.odds);
+      const edgeO = fairO - impO;
       if (edgeO >= MIN_EDGE) {
         const marketConf = calcConfidence(edgeO, group.pairs.length, stdDev(samplesA), avgVig);
         const sBoost = statCtxRaw ? statBoost(statCtxRaw, group.point, true) : 0;
@@ -360,16 +386,17 @@ function processProps(propsGames: PropsGame[]): Play[] {
             side: `Over ${group.point} ${lbl}`,
             market: 'props', propMarket: group.market, playerName: group.playerName,
             point: group.point, bestBook: bestOver.book, bestOdds: bestOver.odds,
-            impliedProb: imp(bestOver.odds), fairProb: fairO, edge: edgeO, confidence: conf,
+            impliedProb: impO, fairProb: fairO, edge: edgeO, confidence: conf,
             statContext,
-            books: [...group.overLines].sort((a, b) => b.odds - a.odds),
+            books: group.overLines.sort((a, b) => b.odds - a.odds),
             units: edgeO >= 0.06 ? 1 : edgeO >= 0.04 ? 0.5 : 0.25,
           });
         }
       }
 
       const bestUnder = group.underLines.reduce((b, x) => x.odds > b.odds ? x : b);
-      const edgeU = fairU - imp(bestUnder.odds);
+      const impU = imp(bestUnder.odds);
+      const edgeU = fairU - impU;
       if (edgeU >= MIN_EDGE) {
         const marketConf = calcConfidence(edgeU, group.pairs.length, stdDev(samplesB), avgVig);
         const sBoost = statCtxRaw ? statBoost(statCtxRaw, group.point, false) : 0;
@@ -385,9 +412,9 @@ function processProps(propsGames: PropsGame[]): Play[] {
             side: `Under ${group.point} ${lbl}`,
             market: 'props', propMarket: group.market, playerName: group.playerName,
             point: group.point, bestBook: bestUnder.book, bestOdds: bestUnder.odds,
-            impliedProb: imp(bestUnder.odds), fairProb: fairU, edge: edgeU, confidence: conf,
+            impliedProb: impU, fairProb: fairU, edge: edgeU, confidence: conf,
             statContext,
-            books: [...group.underLines].sort((a, b) => b.odds - a.odds),
+            books: group.underLines.sort((a, b) => b.odds - a.odds),
             units: edgeU >= 0.06 ? 1 : edgeU >= 0.04 ? 0.5 : 0.25,
           });
         }
@@ -411,9 +438,8 @@ function cleanOldBets(bets: SavedBet[]): SavedBet[] {
 
 // ─── Outcome determination ────────────────────────────────────────────────────
 
-function determineBetOutcome(bet: SavedBet, scores: GameScore[]): 'win' | 'loss' | 'push' | null {
+function determineBetOutcome(bet: SavedBet, game: GameScore | undefined): 'win' | 'loss' | 'push' | null {
   if (bet.market === 'props') return null;
-  const game = scores.find(s => s.id === bet.gameId);
   if (!game?.completed || !game.scores) return null;
   const homeScore = parseFloat(game.scores.find(s => s.name === game.home_team)?.score ?? '');
   const awayScore = parseFloat(game.scores.find(s => s.name === game.away_team)?.score ?? '');
@@ -699,13 +725,17 @@ export default function SportsBetting() {
 
     const sportKeys = [...new Set(pending.map(b => b.sportKey))].filter(Boolean);
     try {
-      const scoreMap: Record<string, GameScore[]> = {};
-      await Promise.all(sportKeys.map(async sk => { scoreMap[sk] = await fetchScores(token, sk); }));
+      // Index scores by game id so each pending bet resolves with one lookup
+      const scoreMap: Record<string, Map<string, GameScore>> = {};
+      await Promise.all(sportKeys.map(async sk => {
+        const scores = await fetchScores(token, sk);
+        scoreMap[sk] = new Map(scores.map(s => [s.id, s]));
+      }));
 
       setSavedBets(prev => {
         const updated = prev.map(bet => {
           if (bet.result || bet.market === 'props' || new Date(bet.commenceTime) > now) return bet;
-          const outcome = determineBetOutcome(bet, scoreMap[bet.sportKey] ?? []);
+          const outcome = determineBetOutcome(bet, scoreMap[bet.sportKey]?.get(bet.gameId));
           if (!outcome) return bet;
           return { ...bet, result: outcome, resolvedAt: new Date().toISOString() };
         });
@@ -728,21 +758,33 @@ export default function SportsBetting() {
   const weekAgo  = new Date(); weekAgo.setDate(weekAgo.getDate() - 7);
 
   const { todayW, todayL, todayP, weekW, weekL, weekP } = useMemo(() => {
-    const resolved = savedBets.filter(b => b.result);
-    const todays   = resolved.filter(b => new Date(b.commenceTime).toDateString() === todayStr);
-    const weeks    = resolved.filter(b => new Date(b.commenceTime) >= weekAgo);
-    return {
-      todayW: todays.filter(b => b.result === 'win').length,
-      todayL: todays.filter(b => b.result === 'loss').length,
-      todayP: todays.filter(b => b.result === 'push').length,
-      weekW:  weeks.filter(b => b.result === 'win').length,
-      weekL:  weeks.filter(b => b.result === 'loss').length,
-      weekP:  weeks.filter(b => b.result === 'push').length,
-    };
+    // Single pass with one date parse per bet — the chained filters each
+    // re-parsed commenceTime for every resolved bet
+    const counts = { todayW: 0, todayL: 0, todayP: 0, weekW: 0, weekL: 0, weekP: 0 };
+    const weekAgoMs = weekAgo.getTime();
+    for (const b of savedBets) {
+      if (!b.result) continue;
+      const d = new Date(b.commenceTime);
+      const key = b.result === 'win' ? 'W' : b.result === 'loss' ? 'L' : 'P';
+      if (d.toDateString() === todayStr) counts[`today${key}` as keyof typeof counts]++;
+      if (d.getTime() >= weekAgoMs) counts[`week${key}` as keyof typeof counts]++;
+    }
+    return counts;
   }, [savedBets]);
 
   const pendingCount = savedBets.filter(b => !b.result && b.market !== 'props' && new Date(b.commenceTime) <= new Date()).length;
 
+  // Sort on a pre-parsed timestamp — dates built inside the comparator would
+  // be re-parsed O(n log n) times on every render
+  const betHistory = useMemo(
+    () => savedBets
+      .map(b => ({ b, ts: Date.parse(b.commenceTime) }))
+      .sort((x, y) => y.ts - x.ts)
+      .slice(0, 100)
+      .map(x => x.b),
+    [savedBets]
+  );
+
   const profit = bankroll.current - bankroll.starting;
   const roi    = bankroll.starting > 0 ? (profit / bankroll.starting) * 100 : 0;
   const total  = bankroll.wins + bankroll.losses;
@@ -914,10 +956,7 @@ export default function SportsBetting() {
           ) : (
             <div className="space-y-2">
               <p className="text-xs text-zinc-600 uppercase tracking-widest font-semibold px-1">Bet History</p>
-              {[...savedBets]
-                .sort((a, b) => new Date(b.commenceTime).getTime() - new Date(a.commenceTime).getTime())
-                .slice(0, 100)
-                .map(bet => <BetResultCard key={bet.id} bet={bet} />)}
+              {betHistory.map(bet => <BetResultCard key={bet.id} bet={bet} />)}
             </div>
           )}
         </div>
@@ -87,9 +87,49 @@ interface FinnhubQuote { c: number; d: number; dp: number; h: number; l: number;
 interface FinnhubProfile { name: string; finnhubIndustry: string; marketCapitalization: number; ticker: string }
 interface FinnhubMetrics { metric: Record<string, number | null> }
 
+const FH_RETRY_STATUS = new Set([429, 500, 502, 503, 504]);
+
 async function fh<T>(path: string, key: string): Promise<T> {
-  const res = await fetch(`https://finnhub.io/api/v1${path}&token=${key}`);
-  return res.json() as Promise<T>;
+  const url = `https://finnhub.io/api/v1${path}&token=${key}`;
+  // The batch endpoints issue dozens of these per request — retry transient
+  // failures with a short backoff so one stray 429 doesn't sink a whole scan
+  for (let attempt = 0; ; attempt++) {
+    const res = await fetch(url);
+    if (FH_RETRY_STATUS.has(res.status) && attempt < 2) {
+      await new Promise(r => setTimeout(r, 250 * (attempt + 1)));
+      continue;
+    }
+    return res.json() as Promise<T>;
+  }
+}
+
+// Fundamentals and profiles move on a daily cadence, unlike quotes — cache
+// them per symbol for an hour so repeat lookups skip Finnhub entirely.
+// `cacheable` must confirm the payload is real data: fh parses error bodies
+// (e.g. rate-limit JSON) too, and caching one would poison the symbol for
+// the full TTL
+async function fhSlow<T>(path: string, key: string, cacheId: string, cacheable: (data: T) => boolean): Promise<T> {
+  const cache = caches.default;
+  const ck = new Request(`https://cache.schlima/finnhub/${cacheId}`);
+  const hit = await cache.match(ck).catch(() => null);
+  if (hit) return hit.json() as Promise<T>;
+  const data = await fh<T>(path, key);
+  if (data && cacheable(data)) {
+    await cache.put(ck, new Response(JSON.stringify(data), {
+      headers: { 'Cache-Control': 'public, max-age=3600', 'Content-Type': 'application/json' },
+    })).catch(() => {});
+  }
+  return data;
+}
+
+function round2(n: number): number {
+  return Math.round(n * 100) / 100;
+}
+
+// Finnhub answers unknown symbols with an all-zero quote object — one
+// finite-positive-price test catches every dead field at once
+function isLiveQuote(q: FinnhubQuote): boolean {
+  return isFinite(q.c) && q.c > 0;
 }
 
 function scorePct(v: number | null | undefined, bad: number, good: number): number {
@@ -113,6 +153,20 @@ function scoreLT(m: Record<string, number | null>): { overall: number; dims: Rec
   return { overall, dims };
 }
 
+// Finnhub's metric=all blob carries hundreds of fields; the scorer, the AI
+// prompt, and the frontend only ever read these
+const LT_METRIC_KEYS = [
+  'revenueGrowth3Y', 'revenueGrowthTTMYoy', 'epsGrowthTTMYoy', 'epsGrowth3Y',
+  'netMarginTTM', 'netMarginAnnual', 'peExclExtraTTM', 'peBasicExclExtraTTM',
+  'pfcfShareTTM', 'totalDebt/totalEquityAnnual', 'roeTTM', 'roe5Y', 'beta',
+];
+
+function pickLTMetrics(m: Record<string, number | null>): Record<string, number | null> {
+  const out: Record<string, number | null> = {};
+  for (const k of LT_METRIC_KEYS) if (m[k] !== undefined) out[k] = m[k];
+  return out;
+}
+
 function ratingFromScore(score: number): string {
   if (score >= 80) return 'STRONG BUY';
   if (score >= 70) return 'WATCHLIST';
@@ -122,6 +176,19 @@ function ratingFromScore(score: number): string {
   return 'PASS';
 }
 
+// Single fetch-and-score pipeline shared by the single-ticker endpoint and
+// the long-term scan, so the same symbol is never fetched or scored twice
+// by two diverging copies of this block
+async function fetchScoredStock(symbol: string, key: string) {
+  const [metrics, quote, profile] = await Promise.all([
+    fhSlow<FinnhubMetrics>(`/stock/metric?symbol=${symbol}&metric=all`, key, `metric/${symbol}`, d => !!d.metric),
+    fh<FinnhubQuote>(`/quote?symbol=${symbol}`, key),
+    fhSlow<FinnhubProfile>(`/stock/profile2?symbol=${symbol}`, key, `profile/${symbol}`, d => !!d.name),
+  ]);
+  const scoring = scoreLT(metrics.metric);
+  return { metrics: metrics.metric, quote, profile, scoring, rating: ratingFromScore(scoring.overall) };
+}
+
 async function callClaude(prompt: string, apiKey: string): Promise<string> {
   try {
     const res = await fetch('https://api.anthropic.com/v1/messages', {
@@ -324,9 +391,10 @@ async function enrichPlayerStats(
   requests: Array<{ playerName: string; market: string }>,
   sport: string,
   cache: Cache,
+  mlbNames?: Promise<Record<string, number>>,
 ): Promise<Record<string, StatContext>> {
   if (sport === 'baseball_mlb') {
-    const nameMap = await mlbNameMap(cache);
+    const nameMap = await (mlbNames ?? mlbNameMap(cache));
     return mlbBatchStats(requests, nameMap, cache);
   }
   if (sport === 'icehockey_nhl') {
@@ -384,8 +452,9 @@ export default {
       try {
         const res = await fetch(scoresUrl.toString());
         if (!res.ok) return json({ error: 'Scores API error' }, 502, cors);
-        const data = await res.json();
-        return new Response(JSON.stringify(data), { headers: { ...cors, 'Content-Type': 'application/json' } });
+        // Proxy the upstream JSON as-is — no need to parse and re-stringify
+        const body = await res.text();
+        return new Response(body, { headers: { ...cors, 'Content-Type': 'application/json' } });
       } catch {
         return json({ error: 'Failed to fetch scores' }, 502, cors);
       }
@@ -397,9 +466,11 @@ export default {
       if (!env.ODDS_API_KEY) return json({ error: 'Odds API not configured' }, 503, cors);
       const sport = url.searchParams.get('sport') ?? 'basketball_nba';
 
-      // 4-hour server-side cache shared across all users
+      // 4-hour server-side cache shared across all users. v2: the response
+      // became { games, playerStats } — versioning the key keeps a fresh
+      // deploy from serving day-old entries in the old array shape
       const propsCache = caches.default;
-      const propsCacheKey = new Request(`https://cache.schlima/props/${sport}`);
+      const propsCacheKey = new Request(`https://cache.schlima/props/v2/${sport}`);
       const propsCached = await propsCache.match(propsCacheKey);
       if (propsCached) {
         const body = await propsCached.text();
@@ -413,17 +484,28 @@ export default {
       };
       const propMarkets = propMarketsMap[sport] ?? 'player_points';
       try {
+        // Kick off the MLB name-map download now so it overlaps the odds fan-out
+        // below; degrade to an empty map at creation so the promise can't become
+        // an unhandled rejection if an early return skips enrichment
+        const cache = caches.default;
+        const mlbNames = sport === 'baseball_mlb'
+          ? mlbNameMap(cache).catch(() => ({})) as Promise<Record<string, number>>
+          : undefined;
         const eventsUrl = new URL(`https://api.the-odds-api.com/v4/sports/${sport}/events/`);
         eventsUrl.searchParams.set('apiKey', env.ODDS_API_KEY);
         const evRes = await fetch(eventsUrl.toString());
         if (!evRes.ok) return json({ error: 'Player props require Odds API Standard plan ($30/mo).' }, 402, cors);
         const events = await evRes.json() as Array<{ id: string; sport_key: string; sport_title: string; commence_time: string; home_team: string; away_team: string }>;
-        const now = new Date();
-        // Analyse up to 10 upcoming games so we have a large pool to filter from
+        const nowMs = Date.now();
+        // Analyse up to 10 upcoming games so we have a large pool to filter from.
+        // Parse each commence_time once — a Date built inside the comparator
+        // would re-parse the strings O(n log n) times
         const upcoming = events
-          .filter(e => new Date(e.commence_time) > now)
-          .sort((a, b) => new Date(a.commence_time).getTime() - new Date(b.commence_time).getTime())
-          .slice(0, 10);
+          .map(e => ({ e, ts: Date.parse(e.commence_time) }))
+          .filter(x => x.ts > nowMs)
+          .sort((a, b) => a.ts - b.ts)
+          .slice(0, 10)
+          .map(x => x.e);
 
         // Fetch prop odds for all games in parallel
         // Track plan errors separately so we can give a clear error when all fetches fail
@@ -470,12 +552,11 @@ export default {
         }
 
         // Enrich with real player stats from official free APIs (MLB + NHL)
-        const cache = caches.default;
-        const playerStats = await enrichPlayerStats(statRequests, sport, cache);
+        const playerStats = await enrichPlayerStats(statRequests, sport, cache, mlbNames);
 
-        // Attach the shared stat map to every game so the frontend can use it
-        const enriched = propsData.map(game => ({ ...game, playerStats }));
-        const propsBody = JSON.stringify(enriched);
+        // Serialize the shared stat map once at the top level rather than
+        // embedding a copy of it in every game
+        const propsBody = JSON.stringify({ games: propsData, playerStats });
         await propsCache.put(propsCacheKey, new Response(propsBody, {
           headers: { 'Cache-Control': 'public, max-age=86400', 'Content-Type': 'application/json' },
         })).catch(() => {});
@@ -516,8 +597,8 @@ export default {
           if (res.status === 401) return json({ error: 'Invalid Odds API key. Check your ODDS_API_KEY secret.' }, 502, cors);
           return json({ error: msg || 'Odds API error' }, 502, cors);
         }
-        const data = await res.json();
-        const body = JSON.stringify(data);
+        // Proxy the upstream JSON as-is — no need to parse and re-stringify
+        const body = await res.text();
         await cache.put(cacheKey, new Response(body, {
           headers: { 'Cache-Control': 'public, max-age=86400', 'Content-Type': 'application/json' },
         }));
@@ -536,16 +617,10 @@ export default {
       const symbol = (url.searchParams.get('symbol') ?? '').toUpperCase();
       if (!symbol) return json({ error: 'symbol required' }, 400, cors);
       try {
-        const [metrics, quote, profile] = await Promise.all([
-          fh<FinnhubMetrics>(`/stock/metric?symbol=${symbol}&metric=all`, env.FINNHUB_API_KEY),
-          fh<FinnhubQuote>(`/quote?symbol=${symbol}`, env.FINNHUB_API_KEY),
-          fh<FinnhubProfile>(`/stock/profile2?symbol=${symbol}`, env.FINNHUB_API_KEY),
-        ]);
+        const { metrics, quote, profile, scoring, rating } = await fetchScoredStock(symbol, env.FINNHUB_API_KEY);
         if (!profile.name) return json({ error: 'Ticker not found' }, 404, cors);
-        const scoring = scoreLT(metrics.metric);
         return new Response(JSON.stringify({
-          ticker: symbol, metrics: metrics.metric, quote, profile,
-          scoring, rating: ratingFromScore(scoring.overall),
+          ticker: symbol, metrics, quote, profile, scoring, rating,
         }), { headers: { ...cors, 'Content-Type': 'application/json' } });
       } catch {
         return json({ error: 'Failed to fetch stock data' }, 502, cors);
@@ -567,7 +642,8 @@ export default {
             .catch(() => null)
         )
       );
-      return new Response(JSON.stringify(quotes.filter(Boolean)), {
+      const live = quotes.filter((q): q is NonNullable<typeof q> => q !== null && isLiveQuote(q));
+      return new Response(JSON.stringify(live), {
         headers: { ...cors, 'Content-Type': 'application/json' },
       });
     }
@@ -582,18 +658,24 @@ export default {
 
       const type = url.searchParams.get('type');
 
+      // Server-side cache: each generate fans out ~60 Finnhub calls, but
+      // fundamentals barely move within an hour and intraday movers stay
+      // valid for a few minutes — serve the same pick to everyone meanwhile
+      const pickCache = caches.default;
+      const pickKey = new Request(`https://cache.schlima/pick/${type}`);
+      const cachedPick = await pickCache.match(pickKey);
+      if (cachedPick) {
+        const body = await cachedPick.text();
+        return new Response(body, { headers: { ...cors, 'Content-Type': 'application/json' } });
+      }
+
       // ── Long-term pick ──────────────────────────────────────────────────────
       if (type === 'longterm') {
         const results = await Promise.all(
           LT_UNIVERSE.map(async (symbol) => {
             try {
-              const [metrics, quote, profile] = await Promise.all([
-                fh<FinnhubMetrics>(`/stock/metric?symbol=${symbol}&metric=all`, env.FINNHUB_API_KEY),
-                fh<FinnhubQuote>(`/quote?symbol=${symbol}`, env.FINNHUB_API_KEY),
-                fh<FinnhubProfile>(`/stock/profile2?symbol=${symbol}`, env.FINNHUB_API_KEY),
-              ]);
-              const scoring = scoreLT(metrics.metric);
-              return { symbol, metrics: metrics.metric, quote, profile, scoring, rating: ratingFromScore(scoring.overall) };
+              const s = await fetchScoredStock(symbol, env.FINNHUB_API_KEY);
+              return { symbol, ...s, metrics: pickLTMetrics(s.metrics) };
             } catch { return null; }
           })
         );
@@ -619,9 +701,11 @@ export default {
           );
         }
 
-        return new Response(JSON.stringify({ top, topThree: stocks.slice(0, 3), ai_thesis }), {
-          headers: { ...cors, 'Content-Type': 'application/json' },
-        });
+        const body = JSON.stringify({ top, topThree: stocks.slice(0, 3), ai_thesis });
+        await pickCache.put(pickKey, new Response(body, {
+          headers: { 'Cache-Control': 'public, max-age=3600', 'Content-Type': 'application/json' },
+        })).catch(() => {});
+        return new Response(body, { headers: { ...cors, 'Content-Type': 'application/json' } });
       }
 
       // ── Day trading pick ────────────────────────────────────────────────────
@@ -644,10 +728,10 @@ export default {
         }
 
         const top = active[0];
-        const entry  = parseFloat(top.c.toFixed(2));
-        const stop   = parseFloat(Math.max(top.l, entry * 0.98).toFixed(2));
+        const entry  = round2(top.c);
+        const stop   = round2(Math.max(top.l, entry * 0.98));
         const risk   = entry - stop;
-        const target = parseFloat((entry + risk * 2.5).toFixed(2));
+        const target = round2(entry + risk * 2.5);
 
         let ai_setup = '';
         if (env.ANTHROPIC_API_KEY) {
@@ -660,11 +744,15 @@ export default {
           );
         }
 
-        return new Response(JSON.stringify({
+        const body = JSON.stringify({
           top: { ...top, entry, stop, target },
           candidates: active.slice(0, 6),
           ai_setup,
-        }), { headers: { ...cors, 'Content-Type': 'application/json' } });
+        });
+        await pickCache.put(pickKey, new Response(body, {
+          headers: { 'Cache-Control': 'public, max-age=300', 'Content-Type': 'application/json' },
+        })).catch(() => {});
+        return new Response(body, { headers: { ...cors, 'Content-Type': 'application/json' } });
       }
 
       return json({ error: 'type must be longterm or daytrading' }, 400, cors);